@@ -2,11 +2,39 @@
 """Post-processing script for caption merging and Devanagari transliteration."""
 
 import argparse
+import concurrent.futures
+import functools
 import json
-import re
+import mmap
+import os
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from indic_transliteration import sanscript
+    from indic_transliteration.sanscript import transliterate
+except ImportError:
+    sanscript = None
+
+
+# Romanization schemes tried by transliterate_to_devanagari
+_SCHEMES = (sanscript.ITRANS, sanscript.HK, sanscript.IAST) if sanscript else ()
+
+# str.translate table deleting the Devanagari block (U+0900 to U+097F)
+_DEVANAGARI_DELETE = dict.fromkeys(range(0x0900, 0x0980))
+
+# Index into _SCHEMES of the scheme that won for the current transcript
+_SCHEME_CACHE: Optional[int] = None
+
+# Code points that end a sentence for merge_captions
+_TERMINAL_PUNCTUATION = frozenset(b'.?!')
+
+# Below this many segments, transliterating in-process beats pool startup
+_PARALLEL_MIN_SEGMENTS = 2000
+
+# Transliterated words per scheme: {scheme: {token: devanagari_token}}
+_TOKEN_CACHE: Dict[str, Dict[str, str]] = {}
 
 
 def parse_srt_timestamp(ts: str) -> float:
@@ -18,11 +46,25 @@ def parse_srt_timestamp(ts: str) -> float:
     Returns:
         Time in seconds as float
     """
-    # Format: HH:MM:SS,mmm
-    time_part, ms_part = ts.split(',')
-    h, m, s = map(int, time_part.split(':'))
-    ms = int(ms_part)
-    return h * 3600 + m * 60 + s + ms / 1000.0
+    # Format: HH:MM:SS,mmm (fixed width)
+    return int(ts[0:2]) * 3600 + int(ts[3:5]) * 60 + int(ts[6:8]) + int(ts[9:12]) / 1000.0
+
+
+def _format_timestamp(seconds: float, sep: str) -> str:
+    """Format seconds as HH:MM:SS<sep>mmm, rounded to the nearest millisecond.
+    
+    Args:
+        seconds: Time in seconds
+        sep: Separator between seconds and milliseconds
+        
+    Returns:
+        Timestamp string
+    """
+    total_ms = int(seconds * 1000 + 0.5)
+    s, ms = divmod(total_ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}{sep}{ms:03d}"
 
 
 def format_srt_timestamp(seconds: float) -> str:
@@ -34,11 +76,7 @@ def format_srt_timestamp(seconds: float) -> str:
     Returns:
         Timestamp string in format HH:MM:SS,mmm
     """
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    ms = int(round((seconds - int(seconds)) * 1000))
-    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+    return _format_timestamp(seconds, ',')
 
 
 def format_vtt_timestamp(seconds: float) -> str:
@@ -50,11 +88,73 @@ def format_vtt_timestamp(seconds: float) -> str:
     Returns:
         Timestamp string in format HH:MM:SS.mmm
     """
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    ms = int(round((seconds - int(seconds)) * 1000))
-    return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+    return _format_timestamp(seconds, '.')
+
+
+def iter_srt_segments(srt_path: Path) -> Iterator[Dict[str, Any]]:
+    """Parse SRT file lazily, yielding one segment per block.
+    
+    The file is memory-mapped and scanned for blank-line block boundaries;
+    only the caption text of each block is decoded.
+    
+    Args:
+        srt_path: Path to SRT file
+        
+    Yields:
+        Segment dictionaries with 'start', 'end', 'text'
+    """
+    with srt_path.open('rb') as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Blocks are separated by a blank line; honour CRLF files too
+            first_eol = mm.find(b'\n')
+            eol = b'\r\n' if first_eol > 0 and mm[first_eol - 1] == 0x0D else b'\n'
+            separator = eol + eol
+            size = len(mm)
+            pos = 0
+            
+            while pos < size:
+                block_end = mm.find(separator, pos)
+                if block_end == -1:
+                    block_end = size
+                block = mm[pos:block_end].strip()
+                pos = block_end + len(separator)
+                
+                # Line 0: sequence number
+                # Line 1: timestamps
+                # Lines 2+: text
+                index_end = block.find(eol)
+                if index_end == -1:
+                    continue
+                ts_start = index_end + len(eol)
+                ts_end = block.find(eol, ts_start)
+                if ts_end == -1:
+                    continue
+                
+                # Timestamps: "00:00:00,000 --> 00:00:01,000" (fixed width)
+                start_ts, _, end_ts = block[ts_start:ts_end].partition(b' --> ')
+                start_ts = start_ts.strip()
+                end_ts = end_ts.strip()
+                try:
+                    start = (int(start_ts[0:2]) * 3600 + int(start_ts[3:5]) * 60
+                             + int(start_ts[6:8]) + int(start_ts[9:12]) / 1000.0)
+                    end = (int(end_ts[0:2]) * 3600 + int(end_ts[3:5]) * 60
+                           + int(end_ts[6:8]) + int(end_ts[9:12]) / 1000.0)
+                except ValueError:
+                    continue
+                
+                text = block[ts_end + len(eol):].decode('utf-8')
+                if eol == b'\r\n':
+                    text = text.replace('\r\n', '\n')
+                
+                yield {
+                    'start': start,
+                    'end': end,
+                    'text': text
+                }
 
 
 def parse_srt_file(srt_path: Path) -> List[Dict[str, Any]]:
@@ -66,78 +166,62 @@ def parse_srt_file(srt_path: Path) -> List[Dict[str, Any]]:
     Returns:
         List of segment dictionaries with 'start', 'end', 'text'
     """
-    segments = []
-    
-    with srt_path.open('r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Split by double newline to get individual subtitle blocks
-    blocks = re.split(r'\n\n+', content.strip())
+    return list(iter_srt_segments(srt_path))
+
+
+def _ends_terminal(text: str) -> bool:
+    """Check whether text ends in terminal punctuation, ignoring trailing whitespace.
     
-    for block in blocks:
-        lines = block.strip().split('\n')
-        if len(lines) < 3:
-            continue
-        
-        # Line 0: sequence number
-        # Line 1: timestamps
-        # Lines 2+: text
-        timestamp_line = lines[1]
-        text = '\n'.join(lines[2:])
-        
-        # Parse timestamps: "00:00:00,000 --> 00:00:01,000"
-        match = re.match(r'(\S+)\s+-->\s+(\S+)', timestamp_line)
-        if not match:
-            continue
-        
-        start_ts, end_ts = match.groups()
-        start = parse_srt_timestamp(start_ts)
-        end = parse_srt_timestamp(end_ts)
+    Args:
+        text: Caption text
         
-        segments.append({
-            'start': start,
-            'end': end,
-            'text': text
-        })
-    
-    return segments
+    Returns:
+        True if the last non-whitespace character is '.', '?' or '!'
+    """
+    i = len(text) - 1
+    while i >= 0 and text[i].isspace():
+        i -= 1
+    return i >= 0 and ord(text[i]) in _TERMINAL_PUNCTUATION
 
 
 def merge_captions(
-    segments: List[Dict[str, Any]],
+    segments: Iterable[Dict[str, Any]],
     max_chars: int = 140,
     max_gap: float = 1.0
 ) -> List[Dict[str, Any]]:
     """Merge adjacent caption segments into full sentences.
     
     Args:
-        segments: List of caption segments
+        segments: Caption segments, in order (any iterable)
         max_chars: Maximum characters before forcing a break
         max_gap: Maximum time gap (seconds) before forcing a break
         
     Returns:
         List of merged segments
     """
-    if not segments:
+    segments = iter(segments)
+    first = next(segments, None)
+    if first is None:
         return []
     
     merged = []
-    current = {
-        'start': segments[0]['start'],
-        'end': segments[0]['end'],
-        'text': segments[0]['text'].strip()
-    }
-    
-    for i in range(1, len(segments)):
-        seg = segments[i]
+    
+    # Text of the segment being built is kept as a list of stripped parts and
+    # joined once when it is emitted. Its length and whether it ends in
+    # terminal punctuation are tracked as parts are added.
+    start = first['start']
+    end = first['end']
+    first_text = first['text'].strip()
+    parts = [first_text]
+    current_len = len(first_text)
+    has_terminal = _ends_terminal(first_text)
+    
+    for seg in segments:
         text = seg['text'].strip()
         
         # Check if we should merge
-        gap = seg['start'] - current['end']
-        combined_text = current['text'] + ' ' + text
-        
-        # Check terminal punctuation in current text
-        has_terminal = current['text'].rstrip().endswith(('.', '?', '!'))
+        gap = seg['start'] - end
+        combined_len = current_len + 1 + len(text)
         
         # Merge if:
         # - No terminal punctuation AND
@@ -146,24 +230,28 @@ def merge_captions(
         should_merge = (
             not has_terminal and
             gap <= max_gap and
-            len(combined_text) <= max_chars
+            combined_len <= max_chars
         )
         
         if should_merge:
             # Merge into current
-            current['end'] = seg['end']
-            current['text'] = combined_text
+            end = seg['end']
+            parts.append(text)
+            current_len = combined_len
+            # Empty parts leave the previous punctuation as the last char
+            if text:
+                has_terminal = _ends_terminal(text)
         else:
             # Save current and start new
-            merged.append(current)
-            current = {
-                'start': seg['start'],
-                'end': seg['end'],
-                'text': text
-            }
+            merged.append({'start': start, 'end': end, 'text': ' '.join(parts)})
+            start = seg['start']
+            end = seg['end']
+            parts = [text]
+            current_len = len(text)
+            has_terminal = _ends_terminal(text)
     
     # Don't forget the last one
-    merged.append(current)
+    merged.append({'start': start, 'end': end, 'text': ' '.join(parts)})
     
     return merged
 
@@ -175,11 +263,13 @@ def write_srt(segments: List[Dict[str, Any]], output_path: Path) -> None:
         segments: List of segments with start, end, text
         output_path: Output SRT file path
     """
+    parts = [
+        f"{i}\n{format_srt_timestamp(seg['start'])} --> {format_srt_timestamp(seg['end'])}\n{seg['text']}\n\n"
+        for i, seg in enumerate(segments, 1)
+    ]
+    
     with output_path.open('w', encoding='utf-8') as f:
-        for i, seg in enumerate(segments, 1):
-            f.write(f"{i}\n")
-            f.write(f"{format_srt_timestamp(seg['start'])} --> {format_srt_timestamp(seg['end'])}\n")
-            f.write(f"{seg['text']}\n\n")
+        f.write(''.join(parts))
 
 
 def write_vtt(segments: List[Dict[str, Any]], output_path: Path) -> None:
@@ -189,11 +279,14 @@ def write_vtt(segments: List[Dict[str, Any]], output_path: Path) -> None:
         segments: List of segments with start, end, text
         output_path: Output VTT file path
     """
+    parts = ["WEBVTT\n\n"]
+    parts.extend(
+        f"{format_vtt_timestamp(seg['start'])} --> {format_vtt_timestamp(seg['end'])}\n{seg['text']}\n\n"
+        for seg in segments
+    )
+    
     with output_path.open('w', encoding='utf-8') as f:
-        f.write("WEBVTT\n\n")
-        for seg in segments:
-            f.write(f"{format_vtt_timestamp(seg['start'])} --> {format_vtt_timestamp(seg['end'])}\n")
-            f.write(f"{seg['text']}\n\n")
+        f.write(''.join(parts))
 
 
 def write_txt(segments: List[Dict[str, Any]], output_path: Path) -> None:
@@ -203,15 +296,80 @@ def write_txt(segments: List[Dict[str, Any]], output_path: Path) -> None:
         segments: List of segments with start, end, text
         output_path: Output text file path
     """
+    parts = [f"{seg['text']}\n" for seg in segments]
+    
     with output_path.open('w', encoding='utf-8') as f:
-        for seg in segments:
-            f.write(f"{seg['text']}\n")
+        f.write(''.join(parts))
+
+
+def write_all(
+    segments: List[Dict[str, Any]],
+    srt_path: Path,
+    vtt_path: Path,
+    txt_path: Path
+) -> None:
+    """Write segments to SRT, VTT and plain text files in a single pass.
+    
+    Each timestamp is formatted once; the VTT form only differs from the
+    SRT form by its millisecond separator.
+    
+    Args:
+        segments: List of segments with start, end, text
+        srt_path: Output SRT file path
+        vtt_path: Output VTT file path
+        txt_path: Output text file path
+    """
+    srt_parts = []
+    vtt_parts = ["WEBVTT\n\n"]
+    txt_parts = []
+    
+    for i, seg in enumerate(segments, 1):
+        timing = f"{format_srt_timestamp(seg['start'])} --> {format_srt_timestamp(seg['end'])}"
+        text = seg['text']
+        srt_parts.append(f"{i}\n{timing}\n{text}\n\n")
+        vtt_parts.append(f"{timing.replace(',', '.')}\n{text}\n\n")
+        txt_parts.append(f"{text}\n")
+    
+    with srt_path.open('w', encoding='utf-8') as srt_f, \
+            vtt_path.open('w', encoding='utf-8') as vtt_f, \
+            txt_path.open('w', encoding='utf-8') as txt_f:
+        srt_f.write(''.join(srt_parts))
+        vtt_f.write(''.join(vtt_parts))
+        txt_f.write(''.join(txt_parts))
+
+
+@functools.lru_cache(maxsize=8192)
+def _transliterate_text(text: str, scheme: str) -> str:
+    """Transliterate text to Devanagari with one scheme, word by word.
+    
+    Args:
+        text: Input romanized text
+        scheme: indic_transliteration source scheme
+        
+    Returns:
+        Transliterated text
+    """
+    cache = _TOKEN_CACHE.setdefault(scheme, {})
+    tokens = text.split(' ')
+    
+    for i, token in enumerate(tokens):
+        if not token:
+            continue
+        result = cache.get(token)
+        if result is None:
+            result = cache[token] = transliterate(token, scheme, sanscript.DEVANAGARI)
+        tokens[i] = result
+    
+    return ' '.join(tokens)
 
 
 def transliterate_to_devanagari(text: str) -> str:
     """Transliterate romanized Hindi/Sanskrit to Devanagari.
     
-    Tries multiple transliteration schemes and picks the best result.
+    Tries multiple transliteration schemes and picks the best result. Once a
+    scheme has clearly won (strictly more Devanagari than every other
+    scheme), later calls use only that scheme until reset_scheme_cache()
+    is called.
     
     Args:
         text: Input romanized text
@@ -219,55 +377,117 @@ def transliterate_to_devanagari(text: str) -> str:
     Returns:
         Transliterated text with Devanagari characters
     """
-    try:
-        from indic_transliteration import sanscript
-        from indic_transliteration.sanscript import transliterate
-    except ImportError:
+    global _SCHEME_CACHE
+    
+    if sanscript is None:
         print("ERROR: indic-transliteration library not installed", file=sys.stderr)
         print("Install with: pip install indic-transliteration", file=sys.stderr)
         return text
     
-    # Try multiple schemes and pick the one with most Devanagari output
-    schemes = [
-        sanscript.ITRANS,
-        sanscript.HK,
-        sanscript.IAST
-    ]
+    # Already Devanagari, nothing to do
+    if any('\u0900' <= c <= '\u097F' for c in text):
+        return text
+    
+    if _SCHEME_CACHE is not None:
+        try:
+            return _transliterate_text(text, _SCHEMES[_SCHEME_CACHE])
+        except Exception:
+            return text
     
+    # Try multiple schemes and pick the one with most Devanagari output
     best_result = text
     best_score = 0
+    best_index = None
+    runner_up_score = 0
     
-    for scheme in schemes:
+    for index, scheme in enumerate(_SCHEMES):
         try:
-            result = transliterate(text, scheme, sanscript.DEVANAGARI)
-            # Count Devanagari characters (U+0900 to U+097F)
-            devanagari_count = sum(1 for c in result if '\u0900' <= c <= '\u097F')
-            
-            if devanagari_count > best_score:
-                best_score = devanagari_count
-                best_result = result
+            result = _transliterate_text(text, scheme)
         except Exception:
             continue
+        
+        # Count Devanagari characters by deleting them at C speed
+        devanagari_count = len(result) - len(result.translate(_DEVANAGARI_DELETE))
+        
+        if devanagari_count > best_score:
+            runner_up_score = best_score
+            best_score = devanagari_count
+            best_result = result
+            best_index = index
+        elif devanagari_count > runner_up_score:
+            runner_up_score = devanagari_count
+    
+    # Only lock the scheme when this text told the schemes apart; on a tie
+    # (e.g. "namaste" is the same in all of them) keep trying all three
+    if best_index is not None and best_score > runner_up_score:
+        _SCHEME_CACHE = best_index
     
     return best_result
 
 
+def reset_scheme_cache() -> None:
+    """Forget the scheme picked by transliterate_to_devanagari.
+    
+    Call this before transliterating a new transcript, which may use a
+    different romanization.
+    """
+    global _SCHEME_CACHE
+    _SCHEME_CACHE = None
+
+
+def _init_transliteration_worker(scheme: Optional[int]) -> None:
+    """Start a transliteration worker process with the transcript's scheme.
+    
+    Args:
+        scheme: Index into _SCHEMES picked by the parent process
+    """
+    global _SCHEME_CACHE
+    _SCHEME_CACHE = scheme
+
+
 def transliterate_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Transliterate all segment texts to Devanagari.
     
+    The scheme is picked on the first segment that tells the schemes apart
+    and reused for the rest, since a transcript is in a single romanization. Long
+    transcripts are transliterated in a process pool.
+    
+    Segments are updated in place; copy them first if the originals are
+    still needed.
+    
     Args:
         segments: List of segments with text
         
     Returns:
-        List of segments with transliterated text
+        The same list, with transliterated text
     """
-    return [
-        {
-            **seg,
-            'text': transliterate_to_devanagari(seg['text'])
-        }
-        for seg in segments
-    ]
+    reset_scheme_cache()
+    
+    # Local alias: avoids a global lookup per segment in the loop below
+    translit = transliterate_to_devanagari
+    texts = [seg['text'] for seg in segments]
+    new_texts = []
+    
+    # Pick the scheme here first so every worker uses the same one
+    pos = 0
+    while _SCHEME_CACHE is None and pos < len(texts):
+        new_texts.append(translit(texts[pos]))
+        pos += 1
+    remaining = texts[pos:]
+    
+    if len(remaining) >= _PARALLEL_MIN_SEGMENTS and (os.cpu_count() or 1) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            initializer=_init_transliteration_worker,
+            initargs=(_SCHEME_CACHE,)
+        ) as executor:
+            new_texts.extend(executor.map(translit, remaining, chunksize=64))
+    else:
+        new_texts.extend(map(translit, remaining))
+    
+    for seg, text in zip(segments, new_texts):
+        seg['text'] = text
+    
+    return segments
 
 
 def main() -> int:
@@ -304,10 +524,13 @@ def main() -> int:
         print(f"ERROR: transcript.srt not found in {input_dir}", file=sys.stderr)
         return 1
     
-    # Parse original segments
+    # Parse original segments. Merging alone consumes them as they are
+    # parsed; transliteration needs them as a list once merging is done.
     print(f"Parsing {srt_path}...")
-    segments = parse_srt_file(srt_path)
-    print(f"✓ Loaded {len(segments)} segments")
+    segments = iter_srt_segments(srt_path)
+    if args.devanagari:
+        segments = list(segments)
+        print(f"✓ Loaded {len(segments)} segments")
     
     # Process merging
     if args.merge_captions:
@@ -316,9 +539,12 @@ def main() -> int:
         print(f"✓ Merged into {len(merged_segments)} segments")
         
         # Write merged outputs
-        write_srt(merged_segments, input_dir / "transcript.merged.srt")
-        write_vtt(merged_segments, input_dir / "transcript.merged.vtt")
-        write_txt(merged_segments, input_dir / "transcript.merged.txt")
+        write_all(
+            merged_segments,
+            input_dir / "transcript.merged.srt",
+            input_dir / "transcript.merged.vtt",
+            input_dir / "transcript.merged.txt"
+        )
         print("✓ Created transcript.merged.*")
     
     # Process Devanagari transliteration
@@ -327,9 +553,12 @@ def main() -> int:
         dev_segments = transliterate_segments(segments)
         
         # Write Devanagari outputs
-        write_srt(dev_segments, input_dir / "transcript.dev.srt")
-        write_vtt(dev_segments, input_dir / "transcript.dev.vtt")
-        write_txt(dev_segments, input_dir / "transcript.dev.txt")
+        write_all(
+            dev_segments,
+            input_dir / "transcript.dev.srt",
+            input_dir / "transcript.dev.vtt",
+            input_dir / "transcript.dev.txt"
+        )
         print("✓ Created transcript.dev.*")
     
     print("\n✓ Post-processing complete!")
@@ -1,7 +1,8 @@
 """Main CLI entry point for YouTube transcription tool."""
 
 import argparse
-import json
+import logging
+import logging.handlers
 import subprocess
 import sys
 from datetime import datetime
@@ -9,7 +10,12 @@ from pathlib import Path
 from typing import Optional
 
 from . import __version__
-from .metadata import extract_video_id, generate_output_folder_name
+from .metadata import (
+    extract_video_id,
+    generate_output_folder_name,
+    load_metadata_from_file,
+    save_metadata_to_file
+)
 from .docker_manager import (
     check_docker_available,
     image_exists,
@@ -20,6 +26,37 @@ from .docker_manager import (
 )
 
 
+log = logging.getLogger("ytx")
+
+# Progress messages buffered before writing when stdout is not a terminal
+LOG_BUFFER_RECORDS = 64
+
+
+def configure_logging() -> None:
+    """Send ytx progress messages to stdout.
+    
+    On a terminal each message is written as it is logged. Otherwise
+    messages are batched and written LOG_BUFFER_RECORDS at a time, before
+    a verbose docker command takes over stdout, and at exit. Calling it
+    again in the same process does nothing.
+    """
+    if log.handlers:
+        return
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    if sys.stdout.isatty():
+        log.addHandler(stream_handler)
+    else:
+        log.addHandler(logging.handlers.MemoryHandler(
+            LOG_BUFFER_RECORDS,
+            flushLevel=logging.ERROR,
+            target=stream_handler
+        ))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
 def update_meta_json(
     output_dir: Path,
     metadata: dict,
@@ -56,10 +93,9 @@ def update_meta_json(
     }
     
     meta_path = output_dir / "meta.json"
-    with meta_path.open("w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2, ensure_ascii=False)
+    save_metadata_to_file(meta_path, meta)
     
-    print(f"✓ Updated {meta_path.name}")
+    log.info(f"✓ Updated {meta_path.name}")
 
 
 def main() -> int:
@@ -157,6 +193,7 @@ Examples:
     )
     
     args = parser.parse_args()
+    configure_logging()
     
     # Check Docker availability
     if not check_docker_available():
@@ -189,7 +226,7 @@ Examples:
             print("ERROR: Failed to build Docker image", file=sys.stderr)
             return 1
     else:
-        print(f"✓ Using existing image '{args.image}'")
+        log.info(f"✓ Using existing image '{args.image}'")
     
     # Extract video ID from URL (no external dependencies)
     video_id = extract_video_id(args.url)
@@ -198,7 +235,7 @@ Examples:
         print("Please provide a valid YouTube URL", file=sys.stderr)
         return 1
     
-    print(f"✓ Video ID: {video_id}")
+    log.info(f"✓ Video ID: {video_id}")
     
     # Determine model path
     model_filename = f"ggml-{args.model}.bin"
@@ -217,13 +254,14 @@ Examples:
         return 1
     
     # Create temporary output folder
-    run_date = datetime.now().strftime("%Y-%m-%d")
+    now = datetime.now()
+    run_date = f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
     temp_folder_name = f"{run_date}__temp__{video_id}"
     temp_output_dir = args.out_root / temp_folder_name
     temp_output_dir.mkdir(parents=True, exist_ok=True)
     
     # Run transcription in Docker (container does everything: metadata, download, transcribe, post-process)
-    print(f"Starting transcription...")
+    log.info(f"Starting transcription...")
     try:
         run_container(
             image_name=args.image,
@@ -249,13 +287,12 @@ Examples:
         print(f"ERROR: Container did not create metadata.json", file=sys.stderr)
         return 1
     
-    with metadata_file.open('r', encoding='utf-8') as f:
-        metadata = json.load(f)
+    metadata = load_metadata_from_file(metadata_file)
     
-    print(f"\n✓ Title: {metadata.get('title', 'Unknown')}")
-    print(f"✓ Channel: {metadata.get('channel', metadata.get('uploader', 'Unknown'))}")
+    log.info(f"\n✓ Title: {metadata.get('title', 'Unknown')}")
+    log.info(f"✓ Channel: {metadata.get('channel', metadata.get('uploader', 'Unknown'))}")
     if metadata.get('duration'):
-        print(f"✓ Duration: {metadata.get('duration')} seconds")
+        log.info(f"✓ Duration: {metadata.get('duration')} seconds")
     
     # Generate final folder name
     final_folder_name = generate_output_folder_name(metadata, run_date)
@@ -276,7 +313,7 @@ Examples:
     
     if temp_output_dir != final_output_dir:
         temp_output_dir.rename(final_output_dir)
-        print(f"✓ Output folder: {final_output_dir}")
+        log.info(f"✓ Output folder: {final_output_dir}")
     
     # Update meta.json with run_date, model, tool_version, etc.
     update_meta_json(
@@ -289,8 +326,8 @@ Examples:
         gpu_used=True
     )
     
-    print(f"\n✅ Transcription complete!")
-    print(f"   Output: {final_output_dir}")
+    log.info(f"\n✅ Transcription complete!")
+    log.info(f"   Output: {final_output_dir}")
     
     return 0
 
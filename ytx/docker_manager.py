@@ -1,35 +1,91 @@
 """Docker image and container management."""
 
+import functools
+import logging
+import os
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
+log = logging.getLogger(__name__)
+
 DEFAULT_IMAGE_NAME = "whispercpp:cuda12"
 DEFAULT_DOCKERFILE = "Dockerfile.whispercpp"
 
+# Lines of container output shown after a non-verbose run
+OUTPUT_TAIL_LINES = 10
+
+# Lines of stderr kept for the error report when a non-verbose run fails
+ERROR_TAIL_LINES = 50
+
+# Seconds the marker touched after a successful `docker info` is trusted for
+DOCKER_OK_TTL = 60
+
+
+def _docker_ok_marker() -> Path:
+    """Path of the marker touched after a successful `docker info`.
+    
+    Raises:
+        RuntimeError: If the home directory cannot be determined
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_dir) / "ytx" / "docker_ok"
+
 
+@functools.lru_cache(maxsize=1)
 def check_docker_available() -> bool:
     """Check if Docker is available and running.
     
+    The result is cached for the process, and a success is also recorded in
+    a marker under ~/.cache/ytx so runs within DOCKER_OK_TTL seconds skip
+    the check.
+    
     Returns:
         True if Docker is available, False otherwise
     """
+    try:
+        marker = _docker_ok_marker()
+    except RuntimeError:
+        # No home directory (e.g. `docker run -u` with an unknown uid)
+        marker = None
+    
+    if marker is not None:
+        try:
+            if time.time() - marker.stat().st_mtime < DOCKER_OK_TTL:
+                return True
+        except OSError:
+            pass
+    
     try:
         subprocess.run(
             ["docker", "info"],
             capture_output=True,
             check=True
         )
-        return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
+    
+    if marker is not None:
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
+    
+    return True
 
 
+@functools.lru_cache(maxsize=8)
 def image_exists(image_name: str) -> bool:
     """Check if Docker image exists locally.
     
+    Results are cached for the process; build_image() clears the cache.
+    
     Args:
         image_name: Name/tag of the Docker image
         
@@ -47,6 +103,49 @@ def image_exists(image_name: str) -> bool:
         return False
 
 
+def _flush_log() -> None:
+    """Write out buffered progress messages before a child process shares stdout."""
+    for handler in logging.getLogger("ytx").handlers:
+        handler.flush()
+
+
+def _run_quiet(cmd: List[str], keep_stdout: bool = False) -> Tuple[int, List[str], List[str]]:
+    """Run a command without echoing its output, keeping only the last lines.
+    
+    Output is read as it is produced so memory stays bounded however much
+    the command prints.
+    
+    Args:
+        cmd: Command to run
+        keep_stdout: If True, keep the tail of stdout; otherwise discard it
+        
+    Returns:
+        Tuple of (return code, stdout tail lines, stderr tail lines)
+    """
+    stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    stderr_tail = deque(maxlen=ERROR_TAIL_LINES)
+    
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE if keep_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    ) as proc:
+        # Drain stderr on a thread so neither pipe can fill up and stall the child
+        reader = threading.Thread(target=stderr_tail.extend, args=(proc.stderr,), daemon=True)
+        reader.start()
+        if keep_stdout:
+            # Blank lines are skipped so the tail shows real output
+            stdout_tail.extend(line for line in proc.stdout if line.strip())
+        reader.join()
+    
+    return (
+        proc.returncode,
+        [line.rstrip("\n") for line in stdout_tail],
+        [line.rstrip("\n") for line in stderr_tail]
+    )
+
+
 def build_image(
     dockerfile: Path,
     image_name: str,
@@ -71,18 +170,20 @@ def build_image(
         str(context_dir)
     ]
     
-    print(f"Building Docker image '{image_name}'...")
-    print(f"This may take several minutes on first build...")
+    log.info(f"Building Docker image '{image_name}'...")
+    log.info(f"This may take several minutes on first build...")
     
     if verbose:
+        _flush_log()
         subprocess.run(cmd, check=True)
     else:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(result.stderr, file=sys.stderr)
-            raise subprocess.CalledProcessError(result.returncode, cmd)
+        returncode, _, stderr_tail = _run_quiet(cmd)
+        if returncode != 0:
+            print("\n".join(stderr_tail), file=sys.stderr)
+            raise subprocess.CalledProcessError(returncode, cmd)
     
-    print(f"✓ Image '{image_name}' built successfully")
+    image_exists.cache_clear()
+    log.info(f"✓ Image '{image_name}' built successfully")
 
 
 def run_container(
@@ -137,16 +238,16 @@ def run_container(
         url
     ])
     
-    print(f"Running transcription in Docker container...")
+    log.info(f"Running transcription in Docker container...")
     
     if verbose:
+        _flush_log()
         subprocess.run(cmd, check=True)
     else:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(result.stderr, file=sys.stderr)
-            raise subprocess.CalledProcessError(result.returncode, cmd)
+        returncode, stdout_tail, stderr_tail = _run_quiet(cmd, keep_stdout=True)
+        if returncode != 0:
+            print("\n".join(stderr_tail), file=sys.stderr)
+            raise subprocess.CalledProcessError(returncode, cmd)
         # Show last few lines of output
-        lines = result.stdout.strip().split("\n")
-        for line in lines[-10:]:
-            print(line)
+        for line in stdout_tail:
+            log.info(line)
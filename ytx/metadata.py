@@ -5,6 +5,56 @@ import re
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    
+    def _loads(data: bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity, which Python's json (e.g. yt-dlp) writes
+            return json.loads(data)
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    
+    _loads = json.loads
+
+# Handles various YouTube URL formats:
+# - https://www.youtube.com/watch?v=VIDEO_ID
+# - https://youtu.be/VIDEO_ID
+# - https://www.youtube.com/embed/VIDEO_ID
+# - https://m.youtube.com/watch?v=VIDEO_ID
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})'
+    r'|v=([a-zA-Z0-9_-]{11})'
+)
+
+
+class _SanitizeTable(dict):
+    """str.translate table that deletes any character it does not map."""
+    
+    def __missing__(self, key: int) -> None:
+        return None
+
+
+# Lowercases ASCII letters, keeps digits, turns spaces and hyphens into
+# underscores and drops everything else
+_SANITIZE_TABLE = _SanitizeTable(
+    {ord(c): c for c in "abcdefghijklmnopqrstuvwxyz0123456789_"}
+)
+_SANITIZE_TABLE.update({ord(c): c.lower() for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"})
+_SANITIZE_TABLE.update({ord(" "): "_", ord("-"): "_"})
+# The only non-ASCII characters whose lowercase form is ASCII
+_SANITIZE_TABLE.update({0x0130: "i", 0x212A: "k"})
+
 
 def extract_video_id(url: str) -> Optional[str]:
     """Extract video ID from YouTube URL.
@@ -15,21 +65,9 @@ def extract_video_id(url: str) -> Optional[str]:
     Returns:
         Video ID string, or None if not found
     """
-    # Handle various YouTube URL formats:
-    # - https://www.youtube.com/watch?v=VIDEO_ID
-    # - https://youtu.be/VIDEO_ID
-    # - https://www.youtube.com/embed/VIDEO_ID
-    # - https://m.youtube.com/watch?v=VIDEO_ID
-    
-    patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})',
-        r'v=([a-zA-Z0-9_-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    match = _VIDEO_ID_RE.search(url)
+    if match:
+        return match.group(1) or match.group(2)
     
     return None
 
@@ -44,24 +82,13 @@ def sanitize_title(title: str, max_length: int = 80) -> str:
     Returns:
         Sanitized title suitable for filesystem use
     """
-    # Convert to lowercase
-    sanitized = title.lower()
-    
-    # Replace spaces with underscores
-    sanitized = sanitized.replace(" ", "_")
-    
-    # Remove unsafe characters (keep only alphanumeric, underscore, hyphen)
-    sanitized = re.sub(r"[^a-z0-9_-]", "", sanitized)
-    
-    # Remove consecutive underscores/hyphens
-    sanitized = re.sub(r"[_-]+", "_", sanitized)
-    
-    # Trim underscores/hyphens from start and end
-    sanitized = sanitized.strip("_-")
+    # Keep only alphanumerics and separators, then collapse separator runs
+    # and trim them from the ends (any run of "_"/"-" becomes one "_")
+    sanitized = "_".join(filter(None, title.translate(_SANITIZE_TABLE).split("_")))
     
     # Limit length
     if len(sanitized) > max_length:
-        sanitized = sanitized[:max_length].rstrip("_-")
+        sanitized = sanitized[:max_length].rstrip("_")
     
     return sanitized if sanitized else "video"
 
@@ -75,8 +102,17 @@ def load_metadata_from_file(meta_json_path: Path) -> Dict[str, Any]:
     Returns:
         Metadata dictionary
     """
-    with meta_json_path.open('r', encoding='utf-8') as f:
-        return json.load(f)
+    return _loads(meta_json_path.read_bytes())
+
+
+def save_metadata_to_file(meta_json_path: Path, metadata: Dict[str, Any]) -> None:
+    """Write metadata to a JSON file as indented UTF-8.
+    
+    Args:
+        meta_json_path: Path to JSON file
+        metadata: Metadata dictionary
+    """
+    meta_json_path.write_bytes(_dumps(metadata))
 
 
 def generate_output_folder_name(metadata: Dict[str, Any], run_date: str) -> str: